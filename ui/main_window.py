@@ -11,48 +11,162 @@ Features:
 - Ability to re-load history entries and re-run
 - Threaded requests so UI doesn't freeze
 - Basic logging to data/logs/app.log
+- Uses orjson for JSON encode/decode when installed (pip install orjson)
 - Packaging note: PyInstaller command included at the bottom
 """
 
 import os
 import json
+import codecs
+import atexit
+import contextlib
+import http.cookiejar
 import time
+import queue
 import threading
+import collections
 import sqlite3
 import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 
+try:
+    import orjson  # optional: much faster JSON encode/decode
+except ImportError:
+    orjson = None
+
 # -------------------------------
 # CONFIG
 # -------------------------------
 USE_SQLITE = True   # set False to use JSON storage instead
 DATA_DIR = Path("data")
 DB_FILE = DATA_DIR / "history.db"
-HISTORY_JSON = DATA_DIR / "history.json"
+HISTORY_JSONL = DATA_DIR / "history.jsonl"       # JSON fallback: one entry per line
+LEGACY_HISTORY_JSON = DATA_DIR / "history.json"  # pre-JSONL format, migrated on start
+HISTORY_JSONL_COMPACT_AT = 1000  # rewrite the JSONL file down to 200 lines past this
+PRETTY_MAX_BYTES = 1024 * 1024   # larger response bodies are shown as-is
+PARSED_CACHE_SIZE = 32           # parsed headers/body kept for unchanged history re-sends
+RESPONSE_MAX_BYTES = 50 * 1024 * 1024  # stop downloading a response body past this
+STREAM_CHUNK_BYTES = 64 * 1024
+DISPLAY_MAX_CHARS = 2 * 1024 * 1024  # response tabs show this much until "load full" is clicked
+INSERT_CHUNK_CHARS = 64 * 1024       # text is inserted into Tk in slices of this size
+TRUNCATION_MARKER = "\n... [truncated, click to load full]"
 LOG_FILE = DATA_DIR / "logs" / "app.log"
+HISTORY_BATCH_SIZE = 100        # max rows written per transaction
+HISTORY_FLUSH_INTERVAL = 0.5    # seconds the writer waits to fill a batch
+HISTORY_POLL_MS = 250           # how often the UI checks for newly saved history
+HISTORY_SEARCH_MIN_CHARS = 2    # shorter keywords match nearly everything; show all
 
 # Ensure data dirs
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 (LOG_FILE.parent).mkdir(parents=True, exist_ok=True)
 
-# Logging
-logging.basicConfig(filename=str(LOG_FILE), level=logging.INFO,
-                    format="%(asctime)s %(levelname)s: %(message)s")
+# Logging: callers only enqueue records; a listener thread does the file I/O
+_log_queue = queue.Queue(-1)
+_log_file_handler = logging.FileHandler(str(LOG_FILE))
+_log_file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # registered first, so it runs after close_db
+# QueueHandler only merges msg % args; the file handler applies the real format
+logging.basicConfig(level=logging.INFO, format="%(message)s",
+                    handlers=[logging.handlers.QueueHandler(_log_queue)])
+
+# -------------------------------
+# JSON helpers: orjson when installed, stdlib otherwise
+# -------------------------------
+def json_dumps(obj, pretty=False):
+    """Serialize obj to a str (non-ASCII kept as-is; 2-space indent if pretty)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the stdlib handles those
+    return json.dumps(obj, indent=2 if pretty else None, ensure_ascii=False)
+
+def json_loads(s):
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except ValueError:
+            pass  # retry with the stdlib, which also accepts big ints/NaN
+    return json.loads(s)
+
+# -------------------------------
+# HTTP: one shared session so repeat requests reuse keep-alive connections
+# -------------------------------
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+# pooling only: like a one-off requests.request(), never carry cookies set by one
+# response into later requests (redirects within one send still keep them)
+SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+def is_json_content_type(content_type):
+    """True for application/json and friends (application/problem+json, ...)."""
+    mime = (content_type or "").split(";", 1)[0].strip().lower()
+    return mime.startswith("application/") and "json" in mime
+
+def pretty_json(content):
+    """Re-indent a JSON string; returns None if it can't be parsed."""
+    try:
+        return json_dumps(json_loads(content), pretty=True)
+    except Exception:  # invalid JSON, or too deeply nested (RecursionError)
+        return None
+
+def format_entry_fields(entry):
+    """Headers/body text for the request editors from a history entry."""
+    headers = entry.get("headers", {}) or {}
+    try:
+        hdr_text = json_dumps(headers, pretty=True)
+    except Exception:
+        hdr_text = str(headers)
+
+    body = entry.get("body", "")
+    try:
+        if isinstance(body, (dict, list)):
+            body_text = json_dumps(body, pretty=True)
+        else:
+            body_text = str(body)
+    except Exception:
+        body_text = str(body)
+    return hdr_text, body_text
 
 # -------------------------------
 # Storage: SQLite helper (if enabled) or JSON fallback
 # -------------------------------
+_conn = None
+_db_lock = threading.Lock()
+# keep SQL text constant so the connection's statement cache reuses the prepared plan
+_INSERT_HISTORY_SQL = "INSERT INTO history (method,url,headers,body,status,response_time,timestamp) VALUES (?,?,?,?,?,?,?)"
+_pending = queue.Queue(maxsize=1000)   # rows waiting for the history writer
+_writer = None
+_FLUSH = object()                  # queued by flush_history(): write the batch now
+_history_saved = threading.Event() # set after new entries are persisted; the UI polls it
+_fts_enabled = False   # history_fts (FTS5) is available for search
+_jsonl_lock = threading.Lock()
+_jsonl_lines = None   # line count of HISTORY_JSONL, counted on first append
+
 def init_db():
-    if not USE_SQLITE:
+    """Open the shared history connection (once) and make sure the schema exists."""
+    global _conn
+    if not USE_SQLITE or _conn is not None:
         return
-    conn = sqlite3.connect(str(DB_FILE))
-    cur = conn.cursor()
-    cur.execute("""
+    # one long-lived connection; writes are serialized through _db_lock
+    conn = sqlite3.connect(str(DB_FILE), check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("""
     CREATE TABLE IF NOT EXISTS history (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         method TEXT,
@@ -64,38 +178,166 @@ def init_db():
         timestamp TEXT
     )
     """)
-    conn.commit()
-    conn.close()
+    _init_fts(conn)
+    _conn = conn
+    _start_writer()
+
+def _init_fts(conn):
+    """Full-text index over method/url/timestamp, kept in sync by triggers.
+    Skipped (search falls back to filtering in Python) if SQLite lacks FTS5."""
+    global _fts_enabled
+    try:
+        with _transaction(conn):  # schema + rebuild land together or not at all
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='history_fts'").fetchone()
+            conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS history_fts
+            USING fts5(method, url, timestamp, content='history', content_rowid='id')
+            """)
+            conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS history_fts_ai AFTER INSERT ON history BEGIN
+                INSERT INTO history_fts(rowid, method, url, timestamp) VALUES (new.id, new.method, new.url, new.timestamp);
+            END
+            """)
+            conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS history_fts_ad AFTER DELETE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, method, url, timestamp) VALUES ('delete', old.id, old.method, old.url, old.timestamp);
+            END
+            """)
+            conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS history_fts_au AFTER UPDATE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, method, url, timestamp) VALUES ('delete', old.id, old.method, old.url, old.timestamp);
+                INSERT INTO history_fts(rowid, method, url, timestamp) VALUES (new.id, new.method, new.url, new.timestamp);
+            END
+            """)
+            if not exists:
+                # index rows written before the FTS table existed
+                conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+        _fts_enabled = True
+    except sqlite3.OperationalError as e:
+        logging.warning("FTS5 unavailable, history search will filter in Python: %s", e)
+
+def close_db():
+    global _conn
+    flush_history()
+    with _db_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+atexit.register(close_db)
+
+@contextlib.contextmanager
+def _transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error). Hold _db_lock once _conn is shared."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # also covers a failed COMMIT (e.g. SQLITE_BUSY), which leaves the
+        # transaction open and would break every later BEGIN on this connection
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+def _get_conn():
+    # storage may be switched to SQLite at runtime (toggle_storage)
+    if _conn is None:
+        init_db()
+    return _conn
+
+def consume_history_saved():
+    """True (once) if history entries were persisted since the last call.
+    Polled from the UI so the writer thread never has to call into Tk."""
+    if _history_saved.is_set():
+        _history_saved.clear()
+        return True
+    return False
+
+def _entry_row(entry: dict):
+    # _headers_json/_body_json: already-serialized text supplied by the sender
+    headers_json = entry.get("_headers_json")
+    if headers_json is None:
+        headers_json = json_dumps(entry.get("headers", {}))
+    body_json = entry.get("_body_json")
+    if body_json is None:
+        body = entry.get("body", "")
+        body_json = json_dumps(body) if isinstance(body, (dict, list)) else str(body)
+    return (entry.get("method"), entry.get("url"),
+            headers_json,
+            body_json,
+            entry.get("status"),
+            entry.get("response_time"),
+            entry.get("timestamp"))
+
+def _write_history_rows(rows):
+    conn = _get_conn()
+    with _db_lock, _transaction(conn):
+        conn.executemany(_INSERT_HISTORY_SQL, rows)
+
+def _history_writer():
+    """Drain the pending queue, writing up to HISTORY_BATCH_SIZE rows per transaction."""
+    while True:
+        item = _pending.get()
+        taken = 1
+        flushing = item is _FLUSH
+        rows = [] if flushing else [item]
+        deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+        while not flushing and len(rows) < HISTORY_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            taken += 1
+            if item is _FLUSH:
+                flushing = True
+            else:
+                rows.append(item)
+        try:
+            if rows:
+                _write_history_rows(rows)
+                _history_saved.set()
+        except Exception as e:
+            logging.exception("Failed to save history: %s", e)
+        finally:
+            for _ in range(taken):
+                _pending.task_done()
+
+def _start_writer():
+    global _writer
+    if _writer is None:
+        _writer = threading.Thread(target=_history_writer, name="history-writer", daemon=True)
+        _writer.start()
+
+def flush_history():
+    """Block until every queued history entry has been written. The writer
+    stops waiting for a fuller batch as soon as it sees the flush marker."""
+    if _writer is not None:
+        _pending.put(_FLUSH)
+        _pending.join()
 
 def save_history_entry(entry: dict):
-    """entry: dict with method,url,headers,body,status,response_time,timestamp"""
+    """entry: dict with method,url,headers,body,status,response_time,timestamp
+    SQLite writes are queued and committed in batches by the history writer."""
+    global _jsonl_lines
     try:
         if USE_SQLITE:
-            conn = sqlite3.connect(str(DB_FILE))
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT INTO history (method,url,headers,body,status,response_time,timestamp) VALUES (?,?,?,?,?,?,?)",
-                (entry.get("method"), entry.get("url"),
-                 json.dumps(entry.get("headers", {}), ensure_ascii=False),
-                 json.dumps(entry.get("body", ""), ensure_ascii=False) if isinstance(entry.get("body", ""), (dict, list)) else str(entry.get("body", "")),
-                 entry.get("status"),
-                 entry.get("response_time"),
-                 entry.get("timestamp"))
-            )
-            conn.commit()
-            conn.close()
+            _get_conn()
+            _pending.put(_entry_row(entry))
         else:
-            # JSON fallback
-            data = []
-            if HISTORY_JSON.exists():
-                try:
-                    data = json.loads(HISTORY_JSON.read_text(encoding="utf-8"))
-                except Exception:
-                    data = []
-            data.append(entry)
-            # keep last 200
-            data = data[-200:]
-            HISTORY_JSON.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            # JSON fallback: append-only, compacted once the file grows
+            with _jsonl_lock:
+                if _jsonl_lines is None:
+                    _jsonl_lines = _count_jsonl_lines()
+                with open(HISTORY_JSONL, "a", encoding="utf-8") as f:
+                    f.write(json_dumps({k: v for k, v in entry.items() if not k.startswith("_")}) + "\n")
+                _jsonl_lines += 1
+                if _jsonl_lines > HISTORY_JSONL_COMPACT_AT:
+                    _compact_jsonl(200)
+            _history_saved.set()
     except Exception as e:
         logging.exception("Failed to save history: %s", e)
 
@@ -103,59 +345,138 @@ def load_history(n=200):
     items = []
     try:
         if USE_SQLITE:
-            if not DB_FILE.exists():
-                return []
-            conn = sqlite3.connect(str(DB_FILE))
-            cur = conn.cursor()
-            cur.execute("SELECT id, method, url, headers, body, status, response_time, timestamp FROM history ORDER BY id DESC LIMIT ?", (n,))
-            rows = cur.fetchall()
-            conn.close()
-            for r in rows:
-                items.append({
-                    "id": r[0],
-                    "method": r[1],
-                    "url": r[2],
-                    "headers": json.loads(r[3]) if r[3] else {},
-                    "body": try_json_load(r[4]),
-                    "status": r[5],
-                    "response_time": r[6],
-                    "timestamp": r[7]
-                })
+            conn = _get_conn()
+            with _db_lock:
+                rows = conn.execute("SELECT id, method, url, headers, body, status, response_time, timestamp FROM history ORDER BY id DESC LIMIT ?", (n,)).fetchall()
+            items = [_row_to_entry(r) for r in rows]
         else:
-            if not HISTORY_JSON.exists():
+            if not HISTORY_JSONL.exists():
                 return []
-            data = json.loads(HISTORY_JSON.read_text(encoding="utf-8"))
-            items = list(reversed(data[-n:]))  # most recent first
+            with open(HISTORY_JSONL, encoding="utf-8") as f:
+                lines = collections.deque(f, maxlen=n)
+            for line in reversed(lines):  # most recent first
+                try:
+                    items.append(json_loads(line))
+                except ValueError:
+                    continue  # skip a torn/partial line
     except Exception as e:
         logging.exception("Failed to load history: %s", e)
     return items
 
+def load_history_summary(n=200):
+    """Sidebar rows (id, method, url, timestamp) without the headers/body blobs.
+    The JSON fallback has no ids, so it returns full entries."""
+    if not USE_SQLITE:
+        return load_history(n)
+    try:
+        conn = _get_conn()
+        with _db_lock:
+            rows = conn.execute("SELECT id, method, url, timestamp FROM history ORDER BY id DESC LIMIT ?", (n,)).fetchall()
+        return [{"id": r[0], "method": r[1], "url": r[2], "timestamp": r[3]} for r in rows]
+    except Exception as e:
+        logging.exception("Failed to load history: %s", e)
+        return []
+
+def search_history_summary(keyword, n=200):
+    """Summary rows whose method/url/timestamp match every word of keyword as a
+    prefix, via FTS5. Returns None when FTS isn't usable so callers can fall back."""
+    if not USE_SQLITE or not _fts_enabled:
+        return None
+    # quote each word so URL punctuation isn't read as query syntax
+    terms = ['"' + word.replace('"', '""') + '"*' for word in keyword.split() if any(ch.isalnum() for ch in word)]
+    if not terms:
+        return None
+    try:
+        conn = _get_conn()
+        with _db_lock:
+            rows = conn.execute(
+                "SELECT rowid, method, url, timestamp FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?",
+                (" ".join(terms), n)).fetchall()
+        return [{"id": r[0], "method": r[1], "url": r[2], "timestamp": r[3]} for r in rows]
+    except sqlite3.Error as e:
+        logging.warning("History search failed, falling back: %s", e)
+        return None
+
+def load_history_entry(entry_id):
+    """Full history entry for one id, or None if it no longer exists."""
+    try:
+        conn = _get_conn()
+        with _db_lock:
+            r = conn.execute("SELECT id, method, url, headers, body, status, response_time, timestamp FROM history WHERE id = ?", (entry_id,)).fetchone()
+        return _row_to_entry(r) if r else None
+    except Exception as e:
+        logging.exception("Failed to load history entry %s: %s", entry_id, e)
+        return None
+
+def _row_to_entry(r):
+    return {
+        "id": r[0],
+        "method": r[1],
+        "url": r[2],
+        "headers": json_loads(r[3]) if r[3] else {},
+        "body": try_json_load(r[4]),
+        "status": r[5],
+        "response_time": r[6],
+        "timestamp": r[7]
+    }
+
 def try_json_load(s):
     if not s:
         return ""
     try:
-        return json.loads(s)
+        return json_loads(s)
     except Exception:
         return s
 
+def _count_jsonl_lines():
+    if not HISTORY_JSONL.exists():
+        return 0
+    with open(HISTORY_JSONL, "rb") as f:
+        return sum(1 for _ in f)
+
+def _compact_jsonl(keep):
+    """Rewrite HISTORY_JSONL with only its last `keep` lines. Caller holds _jsonl_lock."""
+    global _jsonl_lines
+    with open(HISTORY_JSONL, encoding="utf-8") as f:
+        lines = collections.deque(f, maxlen=keep)
+    tmp = HISTORY_JSONL.with_suffix(".jsonl.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp, HISTORY_JSONL)
+    _jsonl_lines = len(lines)
+
+def _migrate_legacy_json():
+    """Convert an old history.json array into history.jsonl (once)."""
+    if HISTORY_JSONL.exists() or not LEGACY_HISTORY_JSON.exists():
+        return
+    try:
+        data = json.loads(LEGACY_HISTORY_JSON.read_text(encoding="utf-8"))
+        with open(HISTORY_JSONL, "w", encoding="utf-8") as f:
+            for entry in data[-200:]:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logging.exception("Failed to migrate %s: %s", LEGACY_HISTORY_JSON, e)
+
 def clear_history_storage():
+    global _jsonl_lines
     try:
         if USE_SQLITE:
-            if DB_FILE.exists():
-                conn = sqlite3.connect(str(DB_FILE))
-                cur = conn.cursor()
-                cur.execute("DELETE FROM history")
-                conn.commit()
-                conn.close()
+            conn = _get_conn()
+            flush_history()  # don't let queued entries reappear after the clear
+            with _db_lock, _transaction(conn):
+                conn.execute("DELETE FROM history")
         else:
-            if HISTORY_JSON.exists():
-                HISTORY_JSON.write_text("[]", encoding="utf-8")
+            with _jsonl_lock:
+                if HISTORY_JSONL.exists():
+                    HISTORY_JSONL.write_text("", encoding="utf-8")
+                _jsonl_lines = 0
     except Exception as e:
         logging.exception("Failed to clear history: %s", e)
 
 # Initialize DB if using sqlite
 if USE_SQLITE:
     init_db()
+_migrate_legacy_json()
 
 # -------------------------------
 # UI
@@ -170,6 +491,17 @@ class APITester(ctk.CTk):
         self.geometry("1200x760")
         self.minsize(1000, 650)
 
+        # bounded worker pool for network calls; one send in flight at a time
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-worker")
+        self._sending = False
+        self._closing = False
+        self._select_seq = 0   # ignores stale history formatting results
+        self._response_seq = 0 # bumped whenever the Body tab gets new content
+        # re-sending an unchanged history entry skips re-parsing its headers/body
+        self._loaded_fields = None   # (id, method, url, headers text, body text) as loaded
+        self._parsed_cache = {}      # history id -> (headers, body)
+        self._parsed_lock = threading.Lock()  # worker fills it, Clear empties it
+
         # layout frames
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -186,7 +518,7 @@ class APITester(ctk.CTk):
         self.search_var = tk.StringVar()
         self.search_entry = ctk.CTkEntry(self.history_frame, placeholder_text="Search history (method/url)...", textvariable=self.search_var)
         self.search_entry.pack(fill="x", padx=12, pady=(0,6))
-        self.search_var.trace_add("write", lambda *_: self.populate_history())
+        self.search_var.trace_add("write", lambda *_: self._schedule_history_filter())
 
         self.history_listbox = tk.Listbox(self.history_frame, height=24)
         self.history_listbox.pack(fill="both", expand=True, padx=12, pady=(0,6))
@@ -255,6 +587,15 @@ class APITester(ctk.CTk):
         self.raw_resp = scrolledtext.ScrolledText(self.tabview.tab("Raw"), wrap="none")
         self.raw_resp.pack(fill="both", expand=True, padx=6, pady=6)
 
+        # large responses are inserted in chunks and capped at DISPLAY_MAX_CHARS;
+        # _full_text keeps the complete text while a tab is still filling or truncated
+        self._full_text = {}
+        self._insert_jobs = {}
+        self._raw_streamed = 0   # chars of the current response already streamed into Raw
+        for w in (self.body_resp, self.headers_resp, self.raw_resp):
+            w.tag_configure("load_full", foreground="#4da3ff", underline=True)
+            w.tag_bind("load_full", "<Button-1>", lambda e, w=w: self._load_full_text(w))
+
         # bottom controls: status, save/export, clear response
         bottom = ctk.CTkFrame(resp_frame, fg_color="transparent")
         bottom.grid(row=1, column=0, sticky="ew", padx=8, pady=(0,8))
@@ -278,6 +619,19 @@ class APITester(ctk.CTk):
         self.bind_all("<Control-l>", lambda e: self.clear_response())
         self.bind_all("<Control-Shift-H>", lambda e: self.on_clear_history())
 
+        # history rows are cached in memory; searching filters the cache and
+        # only saves/clears/reloads go back to storage
+        self._history_cache = None
+        self._history_rows = []       # (display text, lower-cased text, item) per cached entry
+        self._history_index = []      # history item behind each listbox row
+        self._history_dirty = True
+        self._history_filter = None   # keyword the listbox currently reflects
+        self._filter_job = None
+
+        # refresh the list whenever the history writer commits new entries
+        self.after(HISTORY_POLL_MS, self._poll_history_saved)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # populate history initially
         self.populate_history()
 
@@ -287,76 +641,138 @@ class APITester(ctk.CTk):
     def toggle_storage(self):
         global USE_SQLITE
         USE_SQLITE = False if USE_SQLITE else True
+        self._history_dirty = True
         messagebox.showinfo("Storage switched", f"USE_SQLITE set to {USE_SQLITE}. Restart recommended.")
         logging_info = f"Storage toggled: USE_SQLITE={USE_SQLITE}"
         logging.info(logging_info)
 
+    def on_close(self):
+        self._closing = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        flush_history()
+        self.destroy()
+
     def on_reload_history(self):
+        self._history_dirty = True
+        self.populate_history()
+
+    def _poll_history_saved(self):
+        if self._closing:
+            return
+        if consume_history_saved():
+            self.on_history_saved()
+        self.after(HISTORY_POLL_MS, self._poll_history_saved)
+
+    def on_history_saved(self):
+        self._history_dirty = True
         self.populate_history()
 
     def on_clear_history(self):
         if messagebox.askyesno("Clear history", "Are you sure you want to clear all history?"):
             clear_history_storage()
+            self._history_dirty = True
+            with self._parsed_lock:
+                self._parsed_cache.clear()
             self.populate_history()
             logging.info("User cleared history")
             self.status_var.set("History cleared")
 
+    def _schedule_history_filter(self):
+        # debounce: coalesce a burst of keystrokes into a single refresh
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(150, self._run_history_filter)
+
+    def _run_history_filter(self):
+        self._filter_job = None
+        self.populate_history()
+
+    def _history_items(self):
+        if self._history_dirty or self._history_cache is None:
+            self._history_cache = load_history_summary(200)
+            self._history_rows = []
+            for it in self._history_cache:
+                display_text, lowered = self._format_history_row(it)
+                self._history_rows.append((display_text, lowered, it))
+            self._history_dirty = False
+            self._history_filter = None
+        return self._history_cache
+
+    @staticmethod
+    def _format_history_row(it):
+        text = f"{it.get('timestamp','')} - {it.get('method')} {it.get('url')[:60]}"
+        display_text = text if len(text) < 120 else text[:115] + "..."
+        return display_text, text.lower()
+
     def populate_history(self):
-        self.history_listbox.delete(0, tk.END)
-        items = load_history(200)
+        self._history_items()
         keyword = self.search_var.get().strip().lower()
-        for it in items:
-            text = f"{it.get('timestamp','')} - {it.get('method')} {it.get('url')[:60]}"
-            if keyword and keyword not in text.lower():
-                continue
-            display_text = text if len(text) < 120 else text[:115] + "..."
-            self.history_listbox.insert(tk.END, display_text)
-        self.status_var.set(f"Loaded {self.history_listbox.size()} history items")
+        if len(keyword) < HISTORY_SEARCH_MIN_CHARS:
+            keyword = ""
+        if keyword == self._history_filter:
+            return  # listbox already shows this filter over the current cache
+        self._history_filter = keyword
+        matches = search_history_summary(keyword, 200) if keyword else None
+        if matches is not None:
+            visible = [(self._format_history_row(it)[0], it) for it in matches]
+        else:
+            visible = [(display, it) for display, lowered, it in self._history_rows
+                       if not keyword or keyword in lowered]
+        self._history_index = [it for _, it in visible]
+        self.history_listbox.delete(0, tk.END)
+        if visible:
+            self.history_listbox.insert(tk.END, *(display for display, _ in visible))
+        self.status_var.set(f"Loaded {len(visible)} history items")
 
     def on_history_select(self, event):
         sel = self.history_listbox.curselection()
         if not sel:
             return
         idx = sel[0]
-        items = load_history(200)
-        # note: load_history returns most recent first
-        if idx >= len(items):
+        if idx >= len(self._history_index):
             return
-        entry = items[idx]
-        # populate fields
+        item = self._history_index[idx]
+        self._select_seq += 1
+        seq = self._select_seq
+        if item.get("id") is not None:
+            # SQLite summary row: fetch, decode and format the full row on a worker
+            future = self._executor.submit(self._load_entry_detail, item["id"])
+        else:
+            # JSON storage keeps full entries in the cache already
+            future = self._executor.submit(lambda: (item, *format_entry_fields(item)))
+        future.add_done_callback(lambda f: self._call_with_result(f, self._apply_history_fields, seq))
+
+    @staticmethod
+    def _load_entry_detail(entry_id):
+        """Fetch one history row and decode/format its headers and body (worker thread)."""
+        entry = load_history_entry(entry_id)
+        if entry is None:
+            return None
+        return (entry, *format_entry_fields(entry))
+
+    def _apply_history_fields(self, seq, detail):
+        if seq != self._select_seq or detail is None:
+            return  # a newer selection is already being loaded, or the row is gone
+        entry, hdr_text, body_text = detail
         self.method_var.set(entry.get("method", "GET"))
         self.url_entry.delete(0, tk.END)
         self.url_entry.insert(0, entry.get("url", ""))
-        # show headers and body nicely
-        headers = entry.get("headers", {}) or {}
-        try:
-            hdr_text = json.dumps(headers, indent=2, ensure_ascii=False)
-        except Exception:
-            hdr_text = str(headers)
         self.headers_text.delete("1.0", tk.END)
         self.headers_text.insert("1.0", hdr_text)
-
-        body = entry.get("body", "")
-        try:
-            if isinstance(body, (dict, list)):
-                body_text = json.dumps(body, indent=2, ensure_ascii=False)
-            else:
-                body_text = str(body)
-        except Exception:
-            body_text = str(body)
         self.body_text.delete("1.0", tk.END)
         self.body_text.insert("1.0", body_text)
+        self._loaded_fields = (entry.get("id"), self.method_var.get().upper(), self.url_entry.get().strip(),
+                               hdr_text.strip(), body_text.strip())
         self.status_var.set("Loaded from history (you can modify and re-send)")
 
     # -----------------------
     # Request & response
     # -----------------------
     def on_send(self):
-        """Kick off threaded request to avoid freezing UI"""
-        thread = threading.Thread(target=self._send_request_thread, daemon=True)
-        thread.start()
-
-    def _send_request_thread(self):
+        """Hand the request to the worker pool to avoid freezing UI"""
+        if self._sending:
+            return  # ignore repeated Ctrl+Enter while a request is in flight
+        # read widgets here, on the UI thread
         url = self.url_entry.get().strip()
         method = self.method_var.get().upper()
         hdr_input = self.headers_text.get("1.0", tk.END).strip()
@@ -366,50 +782,108 @@ class APITester(ctk.CTk):
             messagebox.showwarning("Missing URL", "Please enter a URL before sending.")
             return
 
-        # parse headers safely
-        headers = {}
-        if hdr_input:
+        # unchanged since loaded from history? then the parsed headers/body can be reused
+        entry_id = None
+        if self._loaded_fields is not None and self._loaded_fields[1:] == (method, url, hdr_input, body_input):
+            entry_id = self._loaded_fields[0]
+
+        self._sending = True
+        self.send_btn.configure(state="disabled")
+        self.status_var.set("Sending...")
+        future = self._executor.submit(self._send_request_thread, url, method, hdr_input, body_input, entry_id)
+        future.add_done_callback(self._send_finished)
+
+    def _send_finished(self, future):
+        # runs on the worker thread
+        if not future.cancelled() and future.exception() is not None:
+            logging.error("Send failed", exc_info=future.exception())
+            self._call_on_ui(self.status_var.set, "Send failed")
+        self._call_on_ui(self._on_send_done)
+
+    def _call_on_ui(self, func, *args):
+        """Schedule func(*args) on the Tk thread (safe to call from workers)."""
+        if not self._closing:
+            self.after(0, func, *args)
+
+    def _call_with_result(self, future, func, *args):
+        """Done-callback helper: func(*args, result) on the Tk thread. Futures
+        cancelled by on_close's shutdown(cancel_futures=True) are ignored."""
+        if future.cancelled():
+            return
+        self._call_on_ui(func, *args, future.result())
+
+    def _on_send_done(self):
+        self._sending = False
+        self.send_btn.configure(state="normal")
+
+    @staticmethod
+    def _prepare_request(method, url, headers, body_for_req):
+        if method in ("GET", "DELETE"):
+            req = requests.Request(method, url, headers=headers)
+        elif isinstance(body_for_req, (dict, list)):
+            # POST/PUT: if body is dict -> send json, else send data
+            req = requests.Request(method, url, headers=headers, json=body_for_req)
+        else:
+            req = requests.Request(method, url, headers=headers, data=body_for_req)
+        return SESSION.prepare_request(req)
+
+    def _send_request_thread(self, url, method, hdr_input, body_input, entry_id=None):
+        with self._parsed_lock:
+            cached = self._parsed_cache.get(entry_id) if entry_id is not None else None
+        if cached is not None:
+            headers, body_for_req = cached
+        else:
+            # parse headers safely
+            headers = {}
+            if hdr_input:
+                try:
+                    headers = json_loads(hdr_input)
+                    if not isinstance(headers, dict):
+                        raise ValueError("Headers must be a JSON object")
+                except Exception as e:
+                    self.safe_show_error("Invalid headers JSON", str(e))
+                    self._call_on_ui(self.status_var.set, "Invalid headers")
+                    return
+
+            # parse body optionally as JSON if possible
+            body_for_req = None
             try:
-                headers = json.loads(hdr_input)
-                if not isinstance(headers, dict):
-                    raise ValueError("Headers must be a JSON object")
-            except Exception as e:
-                self.safe_show_error("Invalid headers JSON", str(e))
-                return
+                if body_input:
+                    body_for_req = json_loads(body_input)
+            except Exception:
+                body_for_req = body_input  # send as raw text if not JSON
 
-        # parse body optionally as JSON if possible
-        body_for_req = None
-        try:
-            if body_input:
-                body_for_req = json.loads(body_input)
-        except Exception:
-            body_for_req = body_input  # send as raw text if not JSON
+            if entry_id is not None:
+                with self._parsed_lock:
+                    if len(self._parsed_cache) >= PARSED_CACHE_SIZE:
+                        self._parsed_cache.pop(next(iter(self._parsed_cache)))
+                    self._parsed_cache[entry_id] = (headers, body_for_req)
 
-        self.status_var.set("Sending...")
         start = time.perf_counter()
         try:
-            # send request with requests.request to support all methods
-            if method in ("GET", "DELETE"):
-                resp = requests.request(method, url, headers=headers, timeout=30)
-            else:
-                # POST/PUT: if body is dict -> send json, else send data
-                if isinstance(body_for_req, (dict, list)):
-                    resp = requests.request(method, url, headers=headers, json=body_for_req, timeout=30)
-                else:
-                    resp = requests.request(method, url, headers=headers, data=body_for_req, timeout=30)
+            # prepared fresh every time so cookies/auth reflect the current state
+            prep = self._prepare_request(method, url, headers, body_for_req)
+            # send() skips the proxy/CA env lookup that request() does, so merge it here
+            settings = SESSION.merge_environment_settings(prep.url, {}, True, None, None)
+            with SESSION.send(prep, timeout=30, **settings) as resp:
+                raw, size, truncated = self._read_body_streaming(resp)
+            if self._closing:
+                return
 
             elapsed = (time.perf_counter() - start) * 1000.0  # ms
-            # attempt JSON pretty print
-            try:
-                body_pretty = json.dumps(resp.json(), indent=4, ensure_ascii=False)
-            except Exception:
-                body_pretty = resp.text
+            # decoded once while streaming; Body/Raw both derive from this string
+            body_pretty = raw
+            if not truncated and is_json_content_type(resp.headers.get("Content-Type")) and size <= PRETTY_MAX_BYTES:
+                try:
+                    body_pretty = json_dumps(json_loads(raw), pretty=True)
+                except Exception:
+                    pass  # not JSON after all, or nested too deep to parse; show raw
 
-            # headers to JSON
-            headers_pretty = json.dumps(dict(resp.headers), indent=4, ensure_ascii=False)
+            # headers as "Name: value" lines, like the raw HTTP header block
+            headers_pretty = "\n".join(f"{k}: {v}" for k, v in resp.headers.items())
 
             # update UI on main thread
-            self.after(0, lambda: self._update_response_ui(body_pretty, headers_pretty, resp.text, resp.status_code, elapsed))
+            self.after(0, lambda: self._update_response_ui(body_pretty, headers_pretty, raw, resp.status_code, elapsed, truncated))
 
             # save to history
             entry = {
@@ -419,27 +893,73 @@ class APITester(ctk.CTk):
                 "body": body_for_req,
                 "status": resp.status_code,
                 "response_time": round(elapsed, 3),
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                # the editor text is already the JSON we parsed; store it as-is
+                "_headers_json": hdr_input or "{}",
+                "_body_json": body_input,
             }
+            # history list is refreshed by the saved callback once the entry is written
             save_history_entry(entry)
             logging.info("%s %s -> %s (%.2f ms)", method, url, resp.status_code, elapsed)
 
-            # reload history list
-            self.after(0, lambda: self.populate_history())
-
         except requests.exceptions.RequestException as e:
             logging.exception("Request error: %s", e)
             self.safe_show_error("Request Error", str(e))
             self.after(0, lambda: self.status_var.set("Request Error"))
 
-    def _update_response_ui(self, body_pretty, headers_pretty, raw_text, status_code, elapsed_ms):
-        self.body_resp.delete("1.0", tk.END)
-        self.body_resp.insert("1.0", body_pretty)
-        self.headers_resp.delete("1.0", tk.END)
-        self.headers_resp.insert("1.0", headers_pretty)
-        self.raw_resp.delete("1.0", tk.END)
-        self.raw_resp.insert("1.0", raw_text)
-        self.status_var.set(f"Status {status_code} • {elapsed_ms:.2f} ms")
+    def _read_body_streaming(self, resp):
+        """Download resp in chunks (worker thread), streaming text into the Raw tab.
+        Returns (text, bytes received, truncated at RESPONSE_MAX_BYTES)."""
+        try:
+            decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._call_on_ui(self._begin_raw_stream)
+        parts = []
+        size = 0
+        truncated = False
+        for chunk in resp.iter_content(STREAM_CHUNK_BYTES):
+            if self._closing:
+                truncated = True
+                break  # window closed: drop the download so exit isn't held up
+            size += len(chunk)
+            piece = decoder.decode(chunk)
+            if piece:
+                parts.append(piece)
+                self._call_on_ui(self._append_raw_stream, piece)
+            if size > RESPONSE_MAX_BYTES:
+                truncated = True
+                break
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts), size, truncated
+
+    def _begin_raw_stream(self):
+        self._set_response_text(self.raw_resp, "")
+        self._raw_streamed = 0
+
+    def _append_raw_stream(self, piece):
+        room = DISPLAY_MAX_CHARS - self._raw_streamed
+        if room > 0:
+            self.raw_resp.insert(tk.END, piece[:room])
+            self._raw_streamed += min(len(piece), room)
+
+    def _finish_raw_stream(self, raw_text):
+        # the Raw tab already holds raw_text[:DISPLAY_MAX_CHARS]; only the marker is left
+        self._full_text[self.raw_resp] = raw_text
+        if len(raw_text) > DISPLAY_MAX_CHARS:
+            self.raw_resp.insert(tk.END, TRUNCATION_MARKER, "load_full")
+        else:
+            self._full_text.pop(self.raw_resp, None)
+
+    def _update_response_ui(self, body_pretty, headers_pretty, raw_text, status_code, elapsed_ms, truncated=False):
+        self._response_seq += 1
+        self._set_response_text(self.body_resp, body_pretty)
+        self._set_response_text(self.headers_resp, headers_pretty)
+        self._finish_raw_stream(raw_text)
+        status = f"Status {status_code} • {elapsed_ms:.2f} ms"
+        if truncated:
+            status += f" • body cut off at {RESPONSE_MAX_BYTES // (1024 * 1024)} MB"
+        self.status_var.set(status)
         # set color-like visual by changing text color: customtkinter label supports text_color
         if 200 <= status_code < 400:
             self.status_label.configure(text_color="#38b000")
@@ -449,29 +969,70 @@ class APITester(ctk.CTk):
     # -----------------------
     # Response helpers
     # -----------------------
+    def _set_response_text(self, widget, text):
+        """Replace a response tab's text without blocking Tk on huge inserts."""
+        job = self._insert_jobs.pop(widget, None)
+        if job is not None:
+            widget.after_cancel(job)
+        widget.delete("1.0", tk.END)
+        self._full_text[widget] = text
+        self._insert_chunked(widget, text, 0, min(len(text), DISPLAY_MAX_CHARS))
+
+    def _insert_chunked(self, widget, text, start, end):
+        stop = min(start + INSERT_CHUNK_CHARS, end)
+        widget.insert(tk.END, text[start:stop])
+        if stop < end:
+            self._insert_jobs[widget] = widget.after_idle(self._insert_chunked, widget, text, stop, end)
+            return
+        self._insert_jobs.pop(widget, None)
+        if end < len(text):
+            widget.insert(tk.END, TRUNCATION_MARKER, "load_full")
+        else:
+            self._full_text.pop(widget, None)
+
+    def _load_full_text(self, widget):
+        text = self._full_text.get(widget)
+        if text is None or widget in self._insert_jobs:
+            return
+        marker = widget.tag_ranges("load_full")
+        if marker:
+            widget.delete(marker[0], marker[1])
+        self._insert_chunked(widget, text, DISPLAY_MAX_CHARS, len(text))
+
+    def _response_text(self, widget):
+        """Complete text of a response tab, even while it is truncated or still filling in."""
+        text = self._full_text.get(widget)
+        return text if text is not None else widget.get("1.0", tk.END)
+
     def pretty_print_response(self):
-        content = self.body_resp.get("1.0", tk.END).strip()
+        content = self._response_text(self.body_resp).strip()
         if not content:
             messagebox.showinfo("Empty", "No response to pretty-print.")
             return
-        try:
-            parsed = json.loads(content)
-            pretty = json.dumps(parsed, indent=4, ensure_ascii=False)
-            self.body_resp.delete("1.0", tk.END)
-            self.body_resp.insert("1.0", pretty)
-            self.tabview.set("Body")
-            self.status_var.set("Pretty-printed JSON")
-        except Exception:
+        self.status_var.set("Formatting JSON...")
+        seq = self._response_seq
+        future = self._executor.submit(pretty_json, content)
+        future.add_done_callback(lambda f: self._call_with_result(f, self._apply_pretty, seq))
+
+    def _apply_pretty(self, seq, pretty):
+        if seq != self._response_seq:
+            return  # the Body tab was replaced or cleared while formatting
+        if pretty is None:
+            self.status_var.set("Ready")
             messagebox.showwarning("Not JSON", "Response body is not valid JSON.")
+            return
+        self._set_response_text(self.body_resp, pretty)
+        self.tabview.set("Body")
+        self.status_var.set("Pretty-printed JSON")
 
     def copy_response(self):
-        text = self.body_resp.get("1.0", tk.END)
+        text = self._response_text(self.body_resp)
         self.clipboard_clear()
         self.clipboard_append(text)
         self.status_var.set("Response copied to clipboard")
 
     def save_response_dialog(self):
-        content = self.body_resp.get("1.0", tk.END).strip()
+        content = self._response_text(self.body_resp).strip()
         if not content:
             messagebox.showwarning("No response", "No response available to save.")
             return
@@ -500,9 +1061,9 @@ class APITester(ctk.CTk):
             messagebox.showerror("Save failed", str(e))
 
     def clear_response(self):
-        self.body_resp.delete("1.0", tk.END)
-        self.headers_resp.delete("1.0", tk.END)
-        self.raw_resp.delete("1.0", tk.END)
+        self._response_seq += 1
+        for w in (self.body_resp, self.headers_resp, self.raw_resp):
+            self._set_response_text(w, "")
         self.status_var.set("Cleared")
 
     def safe_show_error(self, title, message):